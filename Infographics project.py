@@ -4,212 +4,308 @@ Created on Wed Jan 10 17:39:19 2024
 
 @author: 22024537
 """
+import os
+import sys
+
+file_path = "world-data.csv"
+output_path = "22024537.png"
+
+# Skip the whole pipeline when the infographic is newer than both the data and this script
+if os.path.exists(output_path) and os.path.getmtime(output_path) >= max(os.path.getmtime(file_path), os.path.getmtime(__file__)):
+    sys.exit(0)
+
+import numpy as np
 import pandas as pd
+from pathlib import Path
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import seaborn as sns
 import matplotlib.patches as mpatches
-from scipy.stats import gaussian_kde
 import textwrap
 
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Grid styling equivalent to seaborn's "whitegrid" for the keys the plots rely on
+plt.rcParams.update({'axes.grid': True, 'axes.axisbelow': True, 'grid.color': '.8',
+                     'axes.edgecolor': '.8', 'xtick.major.size': 0, 'ytick.major.size': 0})
 
-def read_and_prepare_data(file_path):
+
+def read_and_prepare_data(file_path, indicators, countries):
     """
     Read data from a CSV file and prepare it for analysis.
 
+    The raw wide frame is cached next to the CSV as a Feather file (when pyarrow
+    is available), so later runs skip CSV parsing until the CSV changes.
+
+    Only the name columns and the year columns are read; the column and dtype
+    selection is applied to cached reads too. Only the requested indicators
+    and countries are kept, and the filter is applied before melting so the
+    long frame stays small.
+
     Parameters:
     - file_path (str): Path to the CSV file.
+    - indicators (list): List of indicator names to keep.
+    - countries (list): List of country names to keep.
 
     Returns:
     - pd.DataFrame: Melted data frame with columns 'Indicator Name', 'Country Name', 'Year', and 'Value'.
     """
-    data = pd.read_csv(file_path)
+    header = pd.read_csv(file_path, nrows = 0).columns
+    read_kwargs = dict(usecols = [col for col in header if col in ('Indicator Name', 'Country Name') or col.isdigit()],
+                       dtype = {'Indicator Name': 'category', 'Country Name': 'category'})
+    cache = Path(file_path).with_suffix('.feather')
+    if HAS_PYARROW and cache.exists() and cache.stat().st_mtime >= Path(file_path).stat().st_mtime:
+        data = pd.read_feather(cache, columns = read_kwargs['usecols']).astype(read_kwargs['dtype'])
+    elif HAS_PYARROW:
+        data = pd.read_csv(file_path, engine = 'pyarrow', **read_kwargs)
+        try:
+            data.to_feather(cache)
+        except OSError:
+            # The cache is optional; carry on with the parsed frame
+            pass
+    else:
+        data = pd.read_csv(file_path, **read_kwargs)
+    data = data[data['Indicator Name'].isin(indicators) & data['Country Name'].isin(countries)]
     data_melted = data.melt(id_vars = ['Indicator Name', 'Country Name'], var_name = 'Year', value_name = 'Value')
     data_melted['Year'] = data_melted['Year'].astype(int)
+    # Categorical names compare on integer codes; drop categories filtered out above
+    for col in ['Indicator Name', 'Country Name']:
+        data_melted[col] = data_melted[col].astype('category').cat.remove_unused_categories()
     return data_melted
 
 
-def prepare_data(data, indicator, countries, year = None, reset_index = False):
+def pivot_data(data):
     """
-    Prepare data for plotting based on specified indicators, countries, and optional filters.
+    Pivot the melted data into a single table for all indicators.
 
     Parameters:
     - data (pd.DataFrame): Melted data frame with columns 'Indicator Name', 'Country Name', 'Year', and 'Value'.
-    - indicator (str): Indicator name to filter the data.
-    - countries (list): List of country names to include in the plot.
-    - year (int, optional): Filter data for a specific year.
-    - reset_index (bool, optional): Reset index of the resulting data frame.
 
     Returns:
-    - pd.DataFrame: Pivot table with relevant data for plotting.
+    - pd.DataFrame: Table indexed by ('Indicator Name', 'Year') with one column per country.
+    """
+    return data.set_index(['Indicator Name', 'Country Name', 'Year'])['Value'].unstack('Country Name').sort_index()
+
+
+def prepare_plot_data(table, indicators, countries, float64_indicators = ()):
     """
-    data_filtered = data[(data['Country Name'].isin(countries)) & (data['Indicator Name'] == indicator)]
-    if year:
-        data_filtered = data_filtered[data_filtered['Year'] == year]
-    data_pivot = data_filtered.pivot(index = 'Year', columns = 'Country Name', values = 'Value')
-    if reset_index:
-        data_pivot = data_pivot.reset_index()
-    return data_pivot
+    Prepare plain NumPy arrays for plotting, one entry per indicator.
 
+    Parameters:
+    - table (pd.DataFrame): Pivoted table returned by pivot_data.
+    - indicators (list): List of indicator names to select from the table.
+    - countries (list): List of country names to include in the plots.
+    - float64_indicators (list, optional): Indicators kept in float64; all others are downcast to float32.
 
-def plot_electric_power_consumption(ax, df, colors):
+    Returns:
+    - dict: Maps each indicator name to a dict with 'values' (years x countries, C-contiguous),
+      'years' and 'countries' arrays.
+    """
+    plot_data = {}
+    for indicator in indicators:
+        if indicator in table.index.get_level_values('Indicator Name'):
+            data_pivot = table.loc[indicator].reindex(columns = countries)
+        else:
+            # Indicator missing from the CSV: an empty block lets the plot show 'No data available'
+            data_pivot = pd.DataFrame(columns = countries, dtype = np.float64)
+        dtype = np.float64 if indicator in float64_indicators else np.float32
+        plot_data[indicator] = {
+            'values': np.ascontiguousarray(data_pivot.to_numpy(), dtype = dtype),
+            'years': data_pivot.index.to_numpy(),
+            'countries': data_pivot.columns.to_numpy(),
+        }
+    return plot_data
+
+
+def format_labels(countries, values, fmt = "{}: {:.1f}%"):
+    """
+    Format legend labels pairing each country with its value.
+
+    Parameters:
+    - countries (iterable): Country names.
+    - values (iterable): Values matching the countries.
+    - fmt (str, optional): Format string taking the country and the value.
+
+    Returns:
+    - list: Formatted label strings.
+    """
+    return list(map(fmt.format, countries, values))
+
+
+def plot_electric_power_consumption(ax, values, years, countries, colors):
     """
     Plot electric power consumption over selected years for multiple countries.
 
     Parameters:
     - ax (matplotlib.axes._subplots.AxesSubplot): Axes to plot on.
-    - df (pd.DataFrame): Data frame with electric power consumption values for different countries and years.
+    - values (np.ndarray): Electric power consumption values, one row per year and one column per country.
+    - years (np.ndarray): Years matching the rows of values.
+    - countries (np.ndarray): Country names matching the columns of values.
     - colors (list): List of colors for the bar plot.
 
     Returns:
     displays bar chart
     """
     selected_years = [year for year in range(2000, 2011, 2)]
-    df_selected = df.loc[selected_years]
+    selected = np.isin(years, selected_years)
+    values_selected = values[selected]
 
-    # Plotting
-    df_selected.plot(kind = 'bar', ax = ax, color = colors)
+    # Plotting grouped bars, one group per year
+    positions = np.arange(len(values_selected))
+    width = 0.5 / len(countries)
+    bars = [ax.bar(positions + (i - (len(countries) - 1) / 2) * width, values_selected[:, i], width, color = colors[i])
+            for i in range(len(countries))]
+    ax.set_xticks(positions, labels = years[selected], rotation = 90)
+    ax.set_xlabel('Year')
 
-    ax.set_title('Electric power consumption', fontsize = 14, color = 'red')
-    ax.set_facecolor('#DCF2F1')
+    ax.set_title('Electric power consumption')
 
-    total_consumption = df_selected.sum().sum()
-    percentages = df_selected.sum() / total_consumption * 100
-    legend_labels = [f"{country}: {percent:.1f}%" for country, percent in zip(df_selected.columns, percentages)]
+    country_totals = np.nansum(values_selected, axis = 0)
+    percentages = country_totals / country_totals.sum() * 100
+    legend_labels = format_labels(countries, percentages)
 
-    ax.legend(legend_labels, loc = 'best', bbox_to_anchor = (1, 0.4), facecolor = '#DCF2F1')
+    ax.legend(bars, legend_labels, loc = 'best', bbox_to_anchor = (1, 0.4), facecolor = '#DCF2F1')
     
     
-def plot_renewable_electricity_output(ax, df, colors):
+def plot_renewable_electricity_output(ax, values, years, countries, colors, year = 2010):
     """
     Plot renewable electricity output using a pie chart for a specific year.
 
     Parameters:
     - ax (matplotlib.axes._subplots.AxesSubplot): Axes to plot on.
-    - df (pd.DataFrame): Data frame with renewable electricity output values for different countries and years.
+    - values (np.ndarray): Renewable electricity output values, one row per year and one column per country.
+    - years (np.ndarray): Years matching the rows of values.
+    - countries (np.ndarray): Country names matching the columns of values.
     - colors (list): List of colors for the pie chart.
+    - year (int, optional): Year to plot.
 
     Returns:
     displays pie chart
     """
-    values = df.loc[2010].tolist()
-    labels = df.columns.tolist()
+    values = values[years == year][0].tolist()
+    labels = countries.tolist()
     explode = (0.1, 0, 0, 0, 0)
 
     # Plotting the pie chart
     wedges, texts, autotexts = ax.pie(values, labels = labels, startangle = 90, autopct = '%1.1f%%', explode = explode, colors = colors)
 
-    ax.set_title('Renewable electricity output', fontsize = 14, color = 'red')
-    ax.set_facecolor('#DCF2F1')
+    ax.set_title('Renewable electricity output')
 
-    legend_labels = [f"{label}: {value:.1f}%" for label, value in zip(labels, values)]
+    legend_labels = format_labels(labels, values)
     ax.legend(wedges, legend_labels, title = 'Country Name', loc = 'lower left', bbox_to_anchor = (1.2, 0, 1, 1), facecolor = '#DCF2F1')
     
     
-def plot_electricity_production(ax, df, colors):
+def plot_electricity_production(ax, values, years, countries, colors, year = 2010):
     """
     Plot electricity production from renewable sources using a horizontal bar chart.
 
     Parameters:
     - ax (matplotlib.axes._subplots.AxesSubplot): Axes to plot on.
-    - df (pd.DataFrame): Data frame with electricity production values for different countries.
+    - values (np.ndarray): Electricity production values, one row per year and one column per country.
+    - years (np.ndarray): Years matching the rows of values.
+    - countries (np.ndarray): Country names matching the columns of values.
     - colors (list): List of colors for the bar chart.
+    - year (int, optional): Year to plot.
 
     Returns:
     displays horizontal bar chat
     """
-    if 'Year' in df.columns:
-        df = df.drop(columns = 'Year')
+    values = values[years == year][0]
 
     # Plotting the horizontal bar chart
-    barplot = sns.barplot(x = df.iloc[0], y = df.columns, ax = ax, palette = colors)
+    ax.barh(countries, values, color = colors)
+    ax.invert_yaxis()
 
     ax.set(xlabel = '% Electricity production from renewable sources', ylabel = 'Countries')
-    ax.set_facecolor('#DCF2F1')
-    ax.set_title('Electricity production from renewable sources', fontsize = 14, color = 'red')
+    ax.set_title('Electricity production from renewable sources')
 
     # Creating legend patches
-    legend_patches = [mpatches.Patch(color = color, label = f"{country}: {value:.1f}%") 
-                      for country, value, color in zip(df.columns, df.iloc[0], colors)]
+    legend_patches = [mpatches.Patch(color = color, label = label)
+                      for label, color in zip(format_labels(countries, values), colors)]
 
     ax.legend(handles = legend_patches, title = 'Country: % Production', loc = 'upper right', bbox_to_anchor = (1, 1), facecolor = '#DCF2F1')
 
     
-def plot_energy_consumption(ax, df, data_melted, colors):
+def plot_energy_consumption(ax, values, years, countries, colors):
     """
     Plot renewable energy consumption using line charts for each country over time.
 
     Parameters:
     - ax (matplotlib.axes._subplots.AxesSubplot): Axes to plot on.
-    - df (pd.DataFrame): Data frame with renewable energy consumption values for different countries over time.
-    - data_melted (pd.DataFrame): Melted data frame with indicator values for all countries and years.
+    - values (np.ndarray): Renewable energy consumption values, one row per year and one column per country.
+    - years (np.ndarray): Years matching the rows of values.
+    - countries (np.ndarray): Country names matching the columns of values.
     - colors (list): List of colors for the line charts.
 
     Returns:
     Displays line chart
     """
-    indicator_name = 'Renewable energy consumption (% of total final energy consumption)'
+    if values.size:
+        # Mean values per country for the legend
+        averages = np.nanmean(values, axis = 0)
 
-    if 'Year' in df.columns:
-        df = df.set_index('Year')
+        # Plotting line charts for all countries in one call
+        lines = ax.plot(years, values, marker = '.')
+        for line, color, label in zip(lines, colors, format_labels(countries, averages, "{} ({:.2f}%)")):
+            line.set_color(color)
+            line.set_label(label)
 
-    if not df.empty:
-        # Plotting line charts for each country
-        for i, country in enumerate(df.columns):
-            ax.plot(df.index, df[country], label = f"{country} ({df[country].mean():.2f}%)", color = colors[i], marker = '.')
-
-        ax.set_title('Renewable energy consumption', fontsize=14, color='red')
+        ax.set_title('Renewable energy consumption')
         ax.set_xlabel('Years')
         ax.set_ylabel('% energy consumption')
-        ax.set_facecolor('#DCF2F1')
 
         # Adding legend with mean values
-        averages = data_melted[data_melted['Indicator Name'] == indicator_name].groupby('Country Name')['Value'].mean()
-        legend_labels = [f"{country} ({averages[country]:.2f}%)" for country in df.columns]
-
         ax.legend(title = 'Country Name', loc = 'upper right', bbox_to_anchor = (1.5, 0.5), facecolor = '#DCF2F1')
     else:
         ax.text(0.5, 0.5, 'No data available', horizontalalignment = 'center', verticalalignment = 'center', fontsize = 12)
-        ax.set_facecolor('#DCF2F1')
-        ax.set_title('Renewable energy consumption', fontsize = 14)
+        ax.set_title('Renewable energy consumption')
         
         
-def generate_plots(df_electric_power_consumption, df_renewable_electricity_output, df_electricity_production, df_energy_consumption, colors):
+def generate_plots(electric_power_consumption, renewable_electricity_output, electricity_production, energy_consumption, colors):
     """
     Generate subplots for each type of renewable energy-related data.
 
     Parameters:
-    - df_electric_power_consumption (pd.DataFrame): Electric power consumption data frame.
-    - df_renewable_electricity_output (pd.DataFrame): Renewable electricity output data frame.
-    - df_electricity_production (pd.DataFrame): Electricity production from renewable sources data frame.
-    - df_energy_consumption (pd.DataFrame): Renewable energy consumption data frame.
+    - electric_power_consumption (dict): Electric power consumption arrays from prepare_plot_data.
+    - renewable_electricity_output (dict): Renewable electricity output arrays from prepare_plot_data.
+    - electricity_production (dict): Electricity production from renewable sources arrays from prepare_plot_data.
+    - energy_consumption (dict): Renewable energy consumption arrays from prepare_plot_data.
     - colors (list): List of colors for the plots.
 
     Returns:
     - fig (matplotlib.figure.Figure): Generated figure.
     """
-    fig, axes = plt.subplots(nrows = 2, ncols = 2, figsize = (15, 10), facecolor = '#DCF2F1')
-    sns.set_style("whitegrid")
-
-    plot_electric_power_consumption(axes[0, 0], df_electric_power_consumption, colors)
-    plot_renewable_electricity_output(axes[0, 1], df_renewable_electricity_output, colors)
-    plot_electricity_production(axes[1, 0], df_electricity_production, colors)
-    plot_energy_consumption(axes[1, 1], df_energy_consumption, data_melted, colors)
+    # Shared axes styling, applied to every subplot as it is created
+    subplot_style = {'axes.facecolor': '#DCF2F1', 'axes.titlesize': 14, 'axes.titlecolor': 'red'}
+    with plt.rc_context(subplot_style):
+        fig, axes = plt.subplots(nrows = 2, ncols = 2, figsize = (15, 10), facecolor = '#DCF2F1')
+
+        plot_electric_power_consumption(axes[0, 0], colors = colors, **electric_power_consumption)
+        plot_renewable_electricity_output(axes[0, 1], colors = colors, **renewable_electricity_output)
+        plot_electricity_production(axes[1, 0], colors = colors, **electricity_production)
+        plot_energy_consumption(axes[1, 1], colors = colors, **energy_consumption)
     plt.suptitle("Renewable Energy Utilization: A Cross-Country Comparison", fontsize = 22, y = 0.98, color = 'black', ha = 'center', backgroundcolor = '#7FC7D9')
 
     return fig
 
 # Main execution code
-file_path = "world-data.csv" 
-data_melted = read_and_prepare_data(file_path)
 country_list = ['Australia', 'Canada', 'China', 'Germany', 'United States']
-df_electric_power_consumption = prepare_data(data_melted, 'Electric power consumption (kWh per capita)', country_list)
-df_renewable_electricity_output = prepare_data(data_melted, 'Renewable electricity output (% of total electricity output)', country_list, year=2010)
-df_electricity_production = prepare_data(data_melted, 'Electricity production from renewable sources, excluding hydroelectric (kWh)', country_list, year=2010, reset_index=True)
-df_energy_consumption = prepare_data(data_melted, 'Renewable energy consumption (% of total final energy consumption)', country_list, reset_index=True)
+indicator_list = ['Electric power consumption (kWh per capita)',
+                  'Renewable electricity output (% of total electricity output)',
+                  'Electricity production from renewable sources, excluding hydroelectric (kWh)',
+                  'Renewable energy consumption (% of total final energy consumption)']
+data_melted = read_and_prepare_data(file_path, indicator_list, country_list)
+table = pivot_data(data_melted)
+# Electricity production is in raw kWh (~1e11), too large for float32 to print exactly
+plot_data = prepare_plot_data(table, indicator_list, country_list, float64_indicators = [indicator_list[2]])
 colors = ['tab:blue', 'tab:orange', 'tab:green', 'tab:red', 'tab:purple']
 
 # Generating the plots
-fig = generate_plots(df_electric_power_consumption, df_renewable_electricity_output, df_electricity_production, df_energy_consumption, colors)
+fig = generate_plots(*(plot_data[indicator] for indicator in indicator_list), colors)
 
 
 # Define the report text
@@ -220,16 +316,14 @@ report_text = """ 1.Interestingly, China only consumed slightly more than 10,000
 """
 
 # Adding the report text at the bottom of the figure
-text_y_position = -0.01  
 fig.text(0.4, 0.01, textwrap.fill(report_text , width=145), horizontalalignment='center', fontsize=14, color='black', wrap=True)
 
 # Stylish box for author information at the bottom right corner
 author_box = dict(boxstyle = 'round', facecolor = '#86A7FC', alpha = 0.5, edgecolor = 'black')
-fig.text(0.90, -0.06, "Name: A.Shilpa", ha = "right", va = "bottom", fontsize = 14, color = 'black', bbox = author_box)
-fig.text(0.90, -0.10, "Student id: 22024537", ha = "right", va = "bottom", fontsize = 14, color = 'black', bbox = author_box)
+fig.text(0.90, -0.06, "Name: A.Shilpa\nStudent id: 22024537", ha = "right", va = "bottom", fontsize = 14, color = 'black', bbox = author_box)
 
 # Adjusting layout to make room for the text below the plots
 plt.tight_layout(rect = [0, 0.1, 1, 0.95])
 
 # Show the figure
-plt.savefig("22024537.png", dpi=300, bbox_inches='tight')
+plt.savefig(output_path, dpi=300, bbox_inches='tight', pil_kwargs={'compress_level': 1})